@@ -9,30 +9,31 @@ These are synchronous endpoints for demo/testing. In production you would queue
 """
 
 from fastapi import APIRouter, Query, Body
-from app.agent.manager_agent import ingest_url
-from app.agent.validator_agent import validate_article
+from app.agent.manager_agent import ingest_url_async
+from app.agent.validator_agent import avalidate_article
 
 router = APIRouter(prefix="/agent", tags=["Agent"])
 
 
 @router.post("/ingest")
-def ingest(url: str = Query(..., description="News article URL to ingest")):
+async def ingest(url: str = Query(..., description="News article URL to ingest")):
     """
     Ingest a URL end-to-end: scrape, validate, and store.
     Returns a JSON with status and metadata.
     """
-    result = ingest_url(url)
+    result = await ingest_url_async(url)
     return result
 
 
 @router.post("/validate_text")
-def validate_text(payload: dict = Body(...)):
+async def validate_text(payload: dict = Body(...)):
     """
     Validate a text payload directly (bypass scraper). Useful for testing.
     Body should be JSON: { "text": "...article text..." }
+    The duplicate and LLM checks run concurrently.
     """
     text = payload.get("text", "")
     if not text:
         return {"error": "empty_text"}
-    decision = validate_article(text)
+    decision = await avalidate_article(text)
     return decision
@@ -3,29 +3,67 @@ manager_agent.py
 Manager: scrape -> clean -> validate -> persist to vectordb
 """
 
-from app.agent.news_agent import fetch_url, extract_main_text_from_html, clean_text_with_llm
-from app.agent.validator_agent import validate_article
-from app.rag.vectordb import get_vector_db
+import asyncio
+import uuid
+
+from app.agent.news_agent import (
+    STREAM_FETCH,
+    aclean_text_with_llm,
+    extract_main_text_from_html,
+    fetch_and_extract_streaming,
+    fetch_url,
+)
+from app.agent.validator_agent import (
+    avalidate_article,
+    embed_text,
+    is_duplicate_by_vector,
+    is_long_enough,
+    register_embedding,
+)
 from app.rag.embedder import get_embedding_model
-from langchain_core.documents import Document
-  # langchain 1.x
+from app.rag.splitter import split_text_into_chunks
+from app.rag.writer import BatchWriter, get_default_writer
 
-def ingest_url(url: str) -> dict:
+async def _aingest(url: str, writer: BatchWriter = None) -> dict:
+    """
+    Async ingestion pipeline.
+
+    Blocking steps (HTTP fetch, LLM calls, embedding/vectordb work) run on
+    worker threads, and the independent validation checks run concurrently,
+    so wall time is dominated by the slowest step rather than their sum.
+    """
     result = {"url": url, "status": "error", "reason": None, "metadata": {}}
 
     try:
-        # 1) Fetch HTML
-        html = fetch_url(url)
-
-        # 2) Extract main text heuristically
-        raw_text = extract_main_text_from_html(html)
+        # 1+2) Fetch HTML and extract main text heuristically
+        if STREAM_FETCH:
+            # parse while downloading; never buffers the full page
+            raw_text = await asyncio.to_thread(fetch_and_extract_streaming, url)
+        else:
+            html = await asyncio.to_thread(fetch_url, url)
+            raw_text = extract_main_text_from_html(html)
         if not raw_text or len(raw_text) < 20:
             result["status"] = "error"
             result["reason"] = "no_text_extracted"
             return result
 
+        # 2b) Cheap gates BEFORE any LLM call: pages that are too short or
+        # duplicates of stored articles never pay the cleaning round-trip.
+        if not is_long_enough(raw_text):
+            result["status"] = "rejected"
+            result["reason"] = "too_short"
+            return result
+
+        raw_emb = await asyncio.to_thread(embed_text, raw_text)
+        dup, dup_score = is_duplicate_by_vector(raw_emb)
+        if dup:
+            result["status"] = "rejected"
+            result["reason"] = "duplicate"
+            result["metadata"]["dup_score"] = dup_score
+            return result
+
         # 3) Clean text via LLM to improve quality
-        cleaned = clean_text_with_llm(raw_text)
+        cleaned = await aclean_text_with_llm(raw_text)
         title = cleaned.get("title", "") or ""
         content = cleaned.get("content", "").strip()
 
@@ -34,8 +72,9 @@ def ingest_url(url: str) -> dict:
             result["reason"] = "empty_after_cleaning"
             return result
 
-        # 4) Validate article
-        validation = validate_article(content)
+        # 4) Validate article (duplicate already checked on the raw text,
+        # so only the LLM relevance check remains)
+        validation = await avalidate_article(content, dup_result=(dup, dup_score))
         result["metadata"]["validation"] = validation
 
         if validation["final_decision"] != "approve":
@@ -44,34 +83,41 @@ def ingest_url(url: str) -> dict:
             return result
 
         # 5) Persist to vector DB
-        vectordb = get_vector_db()
         embedding_model = get_embedding_model()
 
-        # Build Document (langchain_core.Document)
-        doc = Document(page_content=content, metadata={"source": url, "title": title})
+        # Split into chunks and embed them in ONE batched encoder call so
+        # tokenizer and matmul overhead is amortized across chunks, then
+        # stage the precomputed vectors with the batch writer (which does
+        # one collection.add + one persist per flush).
+        chunks = split_text_into_chunks([content]) or [content]
+        metadata = {"source": url, "title": title}
 
-        # Try different add APIs depending on installed wrapper
-        add_succeeded = False
-        try:
-            # Preferred: add_documents (many wrappers implement this)
-            vectordb.add_documents([doc])
-            add_succeeded = True
-        except Exception:
+        def _on_write_landed():
+            # Success bookkeeping deferred until the chunks are actually in
+            # Chroma (with the cron writer that's at flush time): only then
+            # is the URL marked completed and its embedding — the one from
+            # the pre-LLM duplicate gate — registered in the dup index. If
+            # the flush fails, neither happens and a retry can re-ingest.
+            _COMPLETED.add(url)
             try:
-                # Fallback: add_texts + metadatas
-                vectordb.add_texts([content], metadatas=[doc.metadata])
-                add_succeeded = True
-            except Exception as ex:
-                result["status"] = "error"
-                result["reason"] = f"vectordb_add_failed: {ex}"
-                return result
-
-        # Persist DB if supported
+                register_embedding(raw_emb)
+            except Exception:
+                pass
+
         try:
-            vectordb.persist()
-        except Exception:
-            # some wrappers persist automatically
-            pass
+            embeddings = await asyncio.to_thread(embedding_model.embed_documents, chunks)
+            await asyncio.to_thread(
+                (writer or get_default_writer()).add,
+                embeddings,
+                chunks,
+                [dict(metadata) for _ in chunks],
+                [str(uuid.uuid4()) for _ in chunks],
+                _on_write_landed,
+            )
+        except Exception as ex:
+            result["status"] = "error"
+            result["reason"] = f"vectordb_add_failed: {ex}"
+            return result
 
         result["status"] = "ingested"
         result["metadata"]["title"] = title
@@ -82,3 +128,45 @@ def ingest_url(url: str) -> dict:
         result["status"] = "error"
         result["reason"] = str(e)
         return result
+
+# URL -> (event loop, running task). Identical URLs requested while one is
+# already being ingested collapse onto the same pipeline instead of
+# re-running fetch + LLM clean + validate for nothing.
+_INFLIGHT = {}
+
+# URLs already ingested in this process; repeats are skipped outright.
+_COMPLETED = set()
+
+async def ingest_url_async(url: str, writer=None) -> dict:
+    """
+    Deduplicating entry point around _aingest.
+
+    - URLs successfully ingested earlier in this process return a
+      "skipped" result without any network or LLM work.
+    - Concurrent requests for the same URL await the single in-flight
+      pipeline (tasks are only shared within the same event loop).
+    """
+    if url in _COMPLETED:
+        return {"url": url, "status": "skipped", "reason": "already_ingested", "metadata": {}}
+
+    loop = asyncio.get_running_loop()
+    existing = _INFLIGHT.get(url)
+    if existing is not None and existing[0] is loop:
+        return await existing[1]
+
+    task = loop.create_task(_aingest(url, writer=writer))
+    _INFLIGHT[url] = (loop, task)
+    try:
+        # _COMPLETED is populated by the pipeline's write-landed callback,
+        # not here, so URLs are only skipped once their data is in Chroma.
+        return await task
+    finally:
+        if _INFLIGHT.get(url) == (loop, task):
+            del _INFLIGHT[url]
+
+def ingest_url(url: str) -> dict:
+    """
+    Synchronous entry point kept for existing callers (routes, scraper).
+    Drives the async pipeline to completion.
+    """
+    return asyncio.run(ingest_url_async(url))
@@ -2,11 +2,56 @@
 news_agent.py
 Scraper + LLM-based cleaner.
 """
+import asyncio
+import os
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+# selectolax (C-based Modest engine) parses HTML 20-50x faster than
+# bs4 + html.parser; fall back to bs4 when it isn't installed.
+try:
+    from selectolax.parser import HTMLParser as _FastHTMLParser
+except ImportError:
+    _FastHTMLParser = None
+
+# google-re2 runs a linear-time DFA with no backtracking; use it for the
+# boilerplate scrub when available, otherwise stdlib re.
+try:
+    import re2 as _re
+except ImportError:
+    import re as _re
+
+import re as _stdlib_re
+
+# Boilerplate that survives extraction ("read more", share bars, posted-on
+# timestamps, ...). Stripping it locally shortens the text sent to the LLM
+# cleaner, making that call cheaper and faster. RE2-compatible: [^\n]*
+# consumes to end-of-line without lookahead, which RE2 doesn't support.
+_NOISE_PATTERN = (
+    r"(?i)\b(read more|share this|advertisement|posted on .{0,30}\d{4}|"
+    r"subscribe to our newsletter)\b[^\n]*"
+)
+_BLANK_LINES_PATTERN = r"\n{3,}"
+
+try:
+    _NOISE_RE = _re.compile(_NOISE_PATTERN)
+    _BLANK_LINES_RE = _re.compile(_BLANK_LINES_PATTERN)
+except Exception:
+    # a pattern RE2 can't take must not break import; fall back to stdlib re
+    _NOISE_RE = _stdlib_re.compile(_NOISE_PATTERN)
+    _BLANK_LINES_RE = _stdlib_re.compile(_BLANK_LINES_PATTERN)
+
+def _strip_noise(text: str) -> str:
+    """Remove known boilerplate lines and collapse the blank runs left behind."""
+    text = _NOISE_RE.sub("", text)
+    return _BLANK_LINES_RE.sub("\n\n", text).strip()
+
 # use local LLM (no API token required)
 from langchain_core.prompts import PromptTemplate
+from app.cache.semantic_cache import semantic_cache
 from app.utils.local_llm import LocalLLM
 
 def _get_llm():
@@ -16,15 +61,148 @@ def _get_llm():
     """
     return LocalLLM(model_name="google/flan-t5-base", max_length=512)
 
+# Built once at import; per-call formatting is then just str.format instead
+# of re-validating input variables and recompiling the template each time.
+_CLEAN_PROMPT = PromptTemplate(
+    input_variables=["raw"],
+    template=(
+        "You are a helpful text-cleaner. Input is raw extracted news HTML text that may contain nav, ads,"
+        " captions, timestamps, and broken sentences. Produce a clean output with two fields:\n\n"
+        "TITLE: <a concise title or empty if none>\n\n"
+        "CONTENT: <cleaned article content, full sentences, no ads, no 'read more' fragments>\n\n"
+        "Only output the TITLE and CONTENT blocks (no extra commentary).\n\nRAW:\n\n{raw}\n\n"
+        "CLEAN OUTPUT:"
+    )
+)
+
+# Shared session so repeated fetches reuse TCP/TLS connections instead of
+# paying a full handshake per article (matters for the cron batch path).
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "User-Agent": "Mozilla/5.0 (compatible; GenAI-Scraper/1.0; +https://example.com/bot)"
+})
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Stream large pages through an incremental parser instead of buffering
+# the full HTML plus a full DOM (needs lxml; falls back to buffered fetch).
+STREAM_FETCH = os.getenv("STREAM_FETCH", "0") in ("1", "true", "yes")
+
 def fetch_url(url: str, timeout: int = 10) -> str:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; GenAI-Scraper/1.0; +https://example.com/bot)"
-    }
-    resp = requests.get(url, headers=headers, timeout=timeout)
+    resp = _SESSION.get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.text
 
+def fetch_url_stream(url: str, timeout: int = 10, chunk_size: int = 65536):
+    """Yield the raw response body in chunks as it arrives."""
+    with _SESSION.get(url, timeout=timeout, stream=True) as resp:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            if chunk:
+                yield chunk
+
+def extract_main_text_from_stream(chunks) -> str:
+    """
+    Incrementally parse HTML chunks, keeping only <p> text and discarding
+    each parsed subtree, so peak memory is the size of the kept text
+    rather than the full page. Requires lxml; without it the chunks are
+    buffered and handed to the regular extractor.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        return extract_main_text_from_html(b"".join(chunks))
+
+    parser = etree.HTMLPullParser(events=("end",), tag="p")
+    paragraphs = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            text = " ".join(t.strip() for t in elem.itertext() if t.strip())
+            if text:
+                paragraphs.append(text)
+            # drop the parsed subtree (and earlier siblings) to bound memory
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+    return _strip_noise("\n\n".join(paragraphs))
+
+def fetch_and_extract_streaming(url: str, timeout: int = 10) -> str:
+    """
+    Streamed fetch + parse: the parser starts before the last byte arrives
+    and the full HTML is never held in memory. Falls back to the buffered
+    path when lxml is missing or the page has no <p> content (so the
+    <article>/body heuristics still get a chance).
+    """
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return extract_main_text_from_html(fetch_url(url, timeout))
+
+    text = extract_main_text_from_stream(fetch_url_stream(url, timeout))
+    if text:
+        return text
+    return extract_main_text_from_html(fetch_url(url, timeout))
+
+async def fetch_many(urls, timeout: int = 10) -> dict:
+    """
+    Fetch many pages concurrently over pooled keep-alive connections.
+    Returns {url: html or Exception}. Uses httpx if installed, otherwise
+    falls back to threaded fetch_url calls on the shared session.
+    """
+    try:
+        import httpx
+    except ImportError:
+        htmls = await asyncio.gather(
+            *[asyncio.to_thread(fetch_url, u, timeout) for u in urls],
+            return_exceptions=True,
+        )
+        return dict(zip(urls, htmls))
+
+    limits = httpx.Limits(max_keepalive_connections=32)
+    headers = dict(_SESSION.headers)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=timeout, follow_redirects=True) as client:
+        async def _fetch(u):
+            resp = await client.get(u)
+            resp.raise_for_status()
+            return resp.text
+
+        htmls = await asyncio.gather(*[_fetch(u) for u in urls], return_exceptions=True)
+    return dict(zip(urls, htmls))
+
 def extract_main_text_from_html(html: str) -> str:
+    if _FastHTMLParser is not None:
+        return _strip_noise(_extract_with_selectolax(html))
+    return _strip_noise(_extract_with_bs4(html))
+
+def _extract_with_selectolax(html: str) -> str:
+    tree = _FastHTMLParser(html)
+
+    # Try <article>
+    article = tree.css_first("article")
+    if article:
+        text = article.text(separator="\n", strip=True)
+        if len(text) > 200:
+            return text
+
+    # Fallback: all <p>
+    pts = [p.text(strip=True) for p in tree.css("p")]
+    pts = [t for t in pts if t]
+    if pts:
+        return "\n\n".join(pts)
+
+    # fallback to body text
+    body = tree.css_first("body")
+    return body.text(separator="\n", strip=True) if body else ""
+
+def _extract_with_bs4(html: str) -> str:
     soup = BeautifulSoup(html, "html.parser")
 
     # Try <article>
@@ -63,22 +241,11 @@ def _call_llm(llm, prompt_text: str) -> str:
             except Exception:
                 return ""  # fail safe
 
+@semantic_cache(namespace="clean", tau=0.92)
 def clean_text_with_llm(raw_text: str) -> dict:
     llm = _get_llm()
 
-    prompt = PromptTemplate(
-        input_variables=["raw"],
-        template=(
-            "You are a helpful text-cleaner. Input is raw extracted news HTML text that may contain nav, ads,"
-            " captions, timestamps, and broken sentences. Produce a clean output with two fields:\n\n"
-            "TITLE: <a concise title or empty if none>\n\n"
-            "CONTENT: <cleaned article content, full sentences, no ads, no 'read more' fragments>\n\n"
-            "Only output the TITLE and CONTENT blocks (no extra commentary).\n\nRAW:\n\n{raw}\n\n"
-            "CLEAN OUTPUT:"
-        )
-    )
-
-    prompt_text = prompt.format(raw=raw_text)
+    prompt_text = _CLEAN_PROMPT.format(raw=raw_text)
     raw_resp = _call_llm(llm, prompt_text) or ""
 
     title = ""
@@ -95,3 +262,13 @@ def clean_text_with_llm(raw_text: str) -> dict:
             content = raw_resp.strip()
 
     return {"title": title, "content": content}
+
+async def aclean_text_with_llm(raw_text: str) -> dict:
+    """
+    Async wrapper around clean_text_with_llm.
+
+    The local pipeline call blocks, so run it on a worker thread. This lets
+    the manager overlap cleaning with other work (validation, embedding)
+    instead of paying each LLM round-trip sequentially.
+    """
+    return await asyncio.to_thread(clean_text_with_llm, raw_text)
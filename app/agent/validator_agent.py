@@ -3,97 +3,210 @@ validator_agent.py
 Checks length, duplicate via embeddings + vectordb, and LLM quick check.
 """
 
+import asyncio
+import itertools
+import os
+import re
+import threading
+
 from app.rag.embedder import get_embedding_model
-from app.rag.vectordb import get_vector_db
+from app.rag.persister import add_persist_hook
+from app.rag.vectordb import CHROMA_DIR, get_vector_db
 from langchain_core.prompts import PromptTemplate
 from app.utils.local_llm import LocalLLM
 import math
 import numpy as np
 
+# FAISS HNSW gives log-N duplicate lookups entirely in C++ with SIMD
+# distance kernels; the int8 matrix scan remains the fallback.
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
 MIN_WORDS = 60
 DUPLICATE_SIMILARITY_THRESHOLD = 0.85  # cosine threshold
 
 def _get_llm():
     return LocalLLM(model_name="google/flan-t5-base", max_length=256)
 
-def is_long_enough(text: str) -> bool:
-    words = text.split()
-    return len(words) >= MIN_WORDS
+# Compiled once at import so validation does no per-call regex compilation.
+_SPAM_RE = re.compile(r"click here|buy now|subscribe|sign up|enter email|404|error")
+_SENTENCE_RE = re.compile(r"[^.]+")
 
-def _cosine(a, b):
-    a = np.array(a, dtype=float)
-    b = np.array(b, dtype=float)
-    if a.size == 0 or b.size == 0:
-        return 0.0
-    denom = (np.linalg.norm(a) * np.linalg.norm(b))
-    return float(np.dot(a, b) / denom) if denom != 0 else 0.0
+_WORD_RE = re.compile(r"\S+")
 
-def is_duplicate(text: str) -> (bool, float):
-    embedding_model = get_embedding_model()
-    vectordb = get_vector_db()
+def is_long_enough(text: str, min_words: int = MIN_WORDS) -> bool:
+    # Count words lazily and stop at min_words instead of materializing
+    # the full word list — constant work for any long article.
+    return sum(1 for _ in itertools.islice(_WORD_RE.finditer(text), min_words)) >= min_words
 
+# In-memory matrix of article embeddings, one row per stored document.
+# Rows are L2-normalized and stored int8-quantized with a per-row scale:
+# the 0.85 threshold only needs ~2 decimals of cosine precision, and int8
+# quarters the memory traffic of the similarity scan vs float32. The
+# duplicate check is a single integer matrix-vector product instead of a
+# Chroma kNN round-trip per call.
+_E_Q = None          # np.ndarray (N, dim) int8, quantized unit-norm rows
+_E_SCALES = None     # np.ndarray (N,) float32, per-row dequantization scale
+_E_LOCK = threading.Lock()
+
+def _quantize(v):
+    """Symmetric per-vector int8 quantization: v ~= q * scale."""
+    v = np.asarray(v, dtype=np.float32)
+    scale = float(np.abs(v).max()) / 127.0
+    if scale == 0.0:
+        return np.zeros(v.shape, dtype=np.int8), 0.0
+    return np.round(v / scale).astype(np.int8), scale
+
+def _load_normalized_embeddings():
+    """Load all stored embeddings from Chroma once, unit-norm float32 rows."""
     try:
-        emb = embedding_model.embed_documents([text])[0]
+        vectordb = get_vector_db()
+        data = vectordb._collection.get(include=["embeddings"])  # type: ignore[attr-defined]
+        embs = data.get("embeddings")
     except Exception:
-        # fallback: some embedding wrappers provide embed_query
-        try:
-            emb = embedding_model.embed_query(text)
-        except Exception:
-            return (False, 0.0)
+        embs = None
 
-    try:
-        # try high-level search_by_vector API
-        results = None
-        try:
-            results = vectordb.similarity_search_by_vector(emb, k=1)
-        except Exception:
-            # fallback: some chroma wrappers expose _collection.query or similar
-            try:
-                # low-level query; may return dicts
-                results = vectordb._collection.query(  # type: ignore[attr-defined]
-                    query_embeddings=[emb],
-                    n_results=1,
-                    include=["metadatas", "distances", "documents"],
-                )
-                # results format differs; compute sim from distances if available
-            except Exception:
-                results = None
-
-        if results:
-            # Try to extract similarity score conservatively
-            # If high-level returned Document objects:
-            if isinstance(results, list) and len(results) > 0:
-                neighbor = results[0]
-                score = getattr(neighbor, "score", None) or getattr(neighbor, "distance", None)
-                if score is not None:
-                    # convert distance -> similarity if needed (many return distance)
-                    sim = float(score)
-                    # if distance style (bigger=bad), ensure threshold logic handles it; we conservatively treat high numbers as low sim
-                    if sim > 1.5:  # heuristic distance >1 usually means low similarity
-                        sim = 0.0
-                else:
-                    sim = 0.0
-            elif isinstance(results, dict):
-                # low-level chroma-like response
+    if embs is not None and len(embs) > 0:
+        E = np.asarray(embs, dtype=np.float32)
+        norms = np.linalg.norm(E, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(E / norms)
+    return np.empty((0, 0), dtype=np.float32)
+
+def _load_embedding_matrix():
+    """Load all stored embeddings from Chroma once: normalize, quantize."""
+    E = _load_normalized_embeddings()
+    if E.size > 0:
+        scales = np.abs(E).max(axis=1).astype(np.float32) / 127.0
+        safe = np.where(scales == 0.0, 1.0, scales)
+        E_q = np.ascontiguousarray(np.round(E / safe[:, None]).astype(np.int8))
+        return E_q, scales
+    return np.empty((0, 0), dtype=np.int8), np.empty((0,), dtype=np.float32)
+
+def _get_embedding_matrix():
+    global _E_Q, _E_SCALES
+    if _E_Q is None:
+        with _E_LOCK:
+            if _E_Q is None:
+                _E_Q, _E_SCALES = _load_embedding_matrix()
+    return _E_Q, _E_SCALES
+
+# Optional FAISS HNSW index over the same unit-norm embeddings
+# (inner product == cosine). Persisted next to the Chroma files so
+# restarts don't rebuild it.
+EMBEDDING_DIM = 384
+_FAISS_PATH = os.path.join(CHROMA_DIR, "dup_index.faiss")
+_FAISS_INDEX = None
+_FAISS_LOCK = threading.Lock()
+
+def _get_faiss_index():
+    global _FAISS_INDEX
+    if faiss is None:
+        return None
+    if _FAISS_INDEX is None:
+        with _FAISS_LOCK:
+            if _FAISS_INDEX is None:
+                index = None
                 try:
-                    distances = results.get("distances", [[]])[0]
-                    if distances:
-                        # convert to similarity via 1 / (1 + dist) heuristic (conservative)
-                        sim = 1.0 / (1.0 + float(distances[0]))
-                    else:
-                        sim = 0.0
+                    if os.path.exists(_FAISS_PATH):
+                        index = faiss.read_index(_FAISS_PATH)
                 except Exception:
-                    sim = 0.0
-            else:
-                sim = 0.0
+                    index = None
+                if index is None:
+                    index = faiss.IndexHNSWFlat(EMBEDDING_DIM, 16, faiss.METRIC_INNER_PRODUCT)
+                    E = _load_normalized_embeddings()
+                    if E.size > 0:
+                        index.add(E)
+                _FAISS_INDEX = index
+                # written by the debounced persister, after Chroma persists,
+                # so the on-disk index never runs ahead of the documents
+                add_persist_hook(_persist_faiss_index)
+    return _FAISS_INDEX
+
+def _persist_faiss_index() -> None:
+    index = _FAISS_INDEX
+    if index is None:
+        return
+    try:
+        with _FAISS_LOCK:
+            faiss.write_index(index, _FAISS_PATH)
+    except Exception:
+        # best-effort; the index rebuilds from Chroma on next startup
+        pass
+
+def register_embedding(emb) -> None:
+    """
+    Append a newly ingested article's embedding to the in-memory matrix
+    so subsequent duplicate checks see it without reloading from Chroma.
+    """
+    v = np.asarray(emb, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    if norm:
+        v = v / norm
+    index = _get_faiss_index()
+    if index is not None:
+        with _FAISS_LOCK:
+            index.add(v.reshape(1, -1))
+
+    q, scale = _quantize(v)
+    global _E_Q, _E_SCALES
+    with _E_LOCK:
+        if _E_Q is None:
+            _E_Q, _E_SCALES = _load_embedding_matrix()
+        if _E_Q.size == 0:
+            _E_Q = np.ascontiguousarray(q.reshape(1, -1))
+            _E_SCALES = np.asarray([scale], dtype=np.float32)
         else:
-            sim = 0.0
+            _E_Q = np.ascontiguousarray(np.vstack([_E_Q, q.reshape(1, -1)]))
+            _E_SCALES = np.append(_E_SCALES, np.float32(scale))
 
+def embed_text(text: str):
+    """Embed text with the local model and return a unit-norm float32 vector."""
+    embedding_model = get_embedding_model()
+    try:
+        emb = embedding_model.embed_documents([text])[0]
     except Exception:
-        sim = 0.0
+        # fallback: some embedding wrappers provide embed_query
+        emb = embedding_model.embed_query(text)
+    v = np.asarray(emb, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm else v
+
+def is_duplicate_by_vector(emb) -> (bool, float):
+    """Duplicate check against the in-memory index; emb must be unit-norm."""
+    index = _get_faiss_index()
+    if index is not None:
+        # FAISS add is not thread-safe against concurrent search (the HNSW
+        # graph is rewritten mid-traversal), so searches take the same lock
+        # as register_embedding; the search itself is microseconds.
+        with _FAISS_LOCK:
+            if index.ntotal > 0:
+                query = np.asarray(emb, dtype=np.float32).reshape(1, -1)
+                D, _ = index.search(query, 1)
+                sim = float(D[0, 0])
+                return (sim >= DUPLICATE_SIMILARITY_THRESHOLD, sim)
+        # empty index: fall through to the matrix scan
 
+    E_q, scales = _get_embedding_matrix()
+    if E_q.size == 0:
+        return (False, 0.0)
+    qv, q_scale = _quantize(emb)
+    # Integer dot products with int32 accumulation (384 * 127^2 overflows
+    # int16), then one per-row rescale back to cosine similarity.
+    dots = E_q.astype(np.int32) @ qv.astype(np.int32)
+    sims = dots.astype(np.float32) * (scales * np.float32(q_scale))
+    sim = float(sims.max())
     return (sim >= DUPLICATE_SIMILARITY_THRESHOLD, sim)
 
+def is_duplicate(text: str) -> (bool, float):
+    try:
+        emb = embed_text(text)
+    except Exception:
+        return (False, 0.0)
+    return is_duplicate_by_vector(emb)
+
 def llm_validate_relevance(text: str) -> dict:
     """
     Simplified validation - checks if text looks like an article.
@@ -107,27 +220,27 @@ def llm_validate_relevance(text: str) -> dict:
         "comment": "Validated using local model"
     }
     
-    # Basic content checks
-    text_lower = text.lower()
-    
-    # Check if it's spam/junk
-    spam_keywords = ["click here", "buy now", "subscribe", "sign up", "enter email", "404", "error"]
-    spam_count = sum(1 for kw in spam_keywords if kw in text_lower)
-    
+    # Basic content checks: lowercase exactly once, then every substring
+    # check runs against the precompiled patterns on that one copy.
+    low = text.casefold()
+
+    # Check if it's spam/junk (count distinct keywords found)
+    spam_count = len(set(_SPAM_RE.findall(low)))
+
     if spam_count > 3:
         out["relevant"] = False
         out["comment"] = "Detected promotional/spam content"
         return out
-    
+
     # Check if it has article-like structure (sentences with punctuation)
-    sentences = [s.strip() for s in text.split('.') if len(s.strip()) > 20]
-    if len(sentences) < 3:
+    n_sentences = sum(1 for m in _SENTENCE_RE.finditer(text) if len(m.group().strip()) > 20)
+    if n_sentences < 3:
         out["relevant"] = False
         out["comment"] = "Not enough structured content"
         return out
-    
+
     # Passed all checks
-    out["comment"] = f"Valid article with {len(sentences)} sentences"
+    out["comment"] = f"Valid article with {n_sentences} sentences"
     return out
 
 def validate_article(text: str) -> dict:
@@ -143,3 +256,32 @@ def validate_article(text: str) -> dict:
         "llm_check": llm_check,
         "final_decision": final
     }
+
+async def avalidate_article(text: str, dup_result: tuple = None) -> dict:
+    """
+    Async version of validate_article.
+
+    The duplicate check (embedding + matrix scan) and the LLM relevance
+    check are independent, so run them concurrently on worker threads
+    instead of back-to-back. Callers that already ran the duplicate check
+    (e.g. the pre-LLM gate in the manager) pass its (flag, score) via
+    dup_result so the text isn't embedded twice.
+    """
+    length_ok = is_long_enough(text)
+    if dup_result is None:
+        (dup, dup_score), llm_check = await asyncio.gather(
+            asyncio.to_thread(is_duplicate, text),
+            asyncio.to_thread(llm_validate_relevance, text),
+        )
+    else:
+        dup, dup_score = dup_result
+        llm_check = await asyncio.to_thread(llm_validate_relevance, text)
+    final = "approve" if (length_ok and (not dup) and llm_check.get("relevant", False) and llm_check.get("safe", True)) else "reject"
+
+    return {
+        "length_ok": length_ok,
+        "is_duplicate": dup,
+        "dup_score": dup_score,
+        "llm_check": llm_check,
+        "final_decision": final
+    }
@@ -0,0 +1,113 @@
+"""
+semantic_cache.py
+-----------------
+Similarity cache for LLM calls.
+
+When the same article is re-crawled (or arrives lightly paraphrased) the
+cleaner and validator would otherwise pay a full LLM round-trip for a
+near-identical input. This cache embeds the input with the local MiniLM
+model, compares it against previously seen inputs with one vectorized
+dot product, and returns the stored response when cosine similarity is
+above a threshold.
+"""
+
+import copy
+import functools
+import threading
+
+import numpy as np
+
+from app.rag.embedder import get_embedding_model
+
+DEFAULT_TAU = 0.92
+DEFAULT_MAXSIZE = 256
+
+
+class SemanticCache:
+    """
+    In-memory vector cache: a (N, dim) float32 matrix of L2-normalized
+    input embeddings plus a parallel list of responses. Lookup is a
+    single matrix-vector product; eviction is least-recently-used.
+    """
+
+    def __init__(self, tau: float = DEFAULT_TAU, maxsize: int = DEFAULT_MAXSIZE):
+        self.tau = tau
+        self.maxsize = maxsize
+        self._vectors = None          # np.ndarray (N, dim), unit-norm rows
+        self._responses = []
+        self._last_used = []          # logical clock per entry, for LRU
+        self._clock = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        v = np.asarray(get_embedding_model().embed_query(text), dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def get(self, query_vec: np.ndarray):
+        """Return the cached response for the closest entry, or None."""
+        with self._lock:
+            if self._vectors is None or not self._responses:
+                return None
+            sims = self._vectors @ query_vec
+            idx = int(np.argmax(sims))
+            if float(sims[idx]) < self.tau:
+                return None
+            self._clock += 1
+            self._last_used[idx] = self._clock
+            return self._responses[idx]
+
+    def put(self, query_vec: np.ndarray, response) -> None:
+        with self._lock:
+            if len(self._responses) >= self.maxsize:
+                evict = int(np.argmin(self._last_used))
+                self._vectors = np.delete(self._vectors, evict, axis=0)
+                del self._responses[evict]
+                del self._last_used[evict]
+
+            row = query_vec.reshape(1, -1)
+            if self._vectors is None:
+                self._vectors = row.copy()
+            else:
+                self._vectors = np.vstack([self._vectors, row])
+            self._responses.append(response)
+            self._clock += 1
+            self._last_used.append(self._clock)
+
+
+# One cache instance per decorated function, addressable by namespace
+# (handy for inspection / clearing in tests).
+_CACHES = {}
+
+
+def semantic_cache(namespace: str, tau: float = DEFAULT_TAU, maxsize: int = DEFAULT_MAXSIZE):
+    """
+    Decorator: cache `fn(text) -> response` by semantic similarity of `text`.
+    On any embedding/cache failure the wrapped function is called normally,
+    so the cache can never break ingestion.
+    """
+    cache = _CACHES.setdefault(namespace, SemanticCache(tau=tau, maxsize=maxsize))
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(text, *args, **kwargs):
+            try:
+                query_vec = cache.embed(text)
+                hit = cache.get(query_vec)
+            except Exception:
+                return fn(text, *args, **kwargs)
+
+            if hit is not None:
+                return copy.deepcopy(hit)
+
+            response = fn(text, *args, **kwargs)
+            try:
+                cache.put(query_vec, copy.deepcopy(response))
+            except Exception:
+                pass
+            return response
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -17,6 +17,30 @@ app.include_router(agent_routes.router)
 app.include_router(scraper_routes.router)
 
 
+@app.on_event("startup")
+def warm_models():
+    """
+    Pre-load the embedding model and vector DB so the first request
+    doesn't pay the model/DB initialization cost.
+    """
+    from app.rag.embedder import get_embedding_model
+    from app.rag.vectordb import get_vector_db
+
+    get_embedding_model()
+    get_vector_db()
+
+
+@app.on_event("shutdown")
+def flush_persister():
+    """
+    Drain the debounced persister so anything still pending is fsynced
+    before the process exits.
+    """
+    from app.rag.persister import shutdown
+
+    shutdown()
+
+
 # Root sanity check
 @app.get("/")
 def home():
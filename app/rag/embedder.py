@@ -7,16 +7,38 @@ We use a FREE HuggingFace Model:
 - all-MiniLM-L6-v2  (small, fast, accurate)
 """
 
+import functools
+import os
+
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
+# "torch" (default) runs the SentenceTransformer; "onnx" uses an
+# ONNX-exported MiniLM through onnxruntime (see app/rag/onnx_embedder.py).
+EMBEDDINGS_BACKEND = os.getenv("EMBEDDINGS_BACKEND", "torch")
+
 
+@functools.lru_cache(maxsize=1)
 def get_embedding_model():
     """
     Returns a FREE encoder model that can embed text chunks.
+
+    Memoized: the SentenceTransformer weights load from disk exactly once
+    per process instead of on every ingest/validate/query call.
     """
 
+    if EMBEDDINGS_BACKEND == "onnx":
+        try:
+            from app.rag.onnx_embedder import OnnxEmbeddings
+            return OnnxEmbeddings()
+        except Exception as e:
+            print(f"⚠️  ONNX embeddings unavailable ({e}); falling back to PyTorch")
+
     embedding_model = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        model_kwargs={"device": "cpu"},
+        # L2-normalize at encode time so cosine similarity downstream is a
+        # plain dot product (no per-comparison norms).
+        encode_kwargs={"batch_size": 64, "normalize_embeddings": True},
     )
 
     return embedding_model
@@ -0,0 +1,98 @@
+"""
+onnx_embedder.py
+----------------
+Optional ONNX Runtime backend for the MiniLM embedding model.
+
+Running MiniLM through the eager fp32 PyTorch graph is the single
+largest CPU cost per article. An ONNX-exported (optionally int8
+dynamically quantized) copy runs 3-5x faster on CPU via onnxruntime,
+which dispatches AVX-512 VNNI kernels where available, at equal recall.
+
+Export once with optimum:
+
+    optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2 ./minilm_onnx
+    optimum-cli onnxruntime quantize --onnx_model ./minilm_onnx --avx512_vnni -o ./minilm_int8
+
+then set EMBEDDINGS_BACKEND=onnx and point ONNX_MODEL_DIR at the output
+directory. The class exposes the same embed_documents/embed_query
+interface as the LangChain wrapper, so the rest of the code is unchanged.
+"""
+
+import glob
+import os
+
+import numpy as np
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "minilm_onnx")
+BASE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_LENGTH = 256
+BATCH_SIZE = 64
+
+
+def _resolve_model_file(model_dir: str) -> str:
+    """
+    Find the ONNX graph inside model_dir. The plain export writes
+    model.onnx but the optimum quantizer writes model_quantized.onnx, so
+    probe the known names first and fall back to any *.onnx file.
+    """
+    for name in ("model_quantized.onnx", "model.onnx"):
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            return path
+    candidates = sorted(glob.glob(os.path.join(model_dir, "*.onnx")))
+    if candidates:
+        return candidates[0]
+    raise FileNotFoundError(f"no .onnx model found in {model_dir!r}")
+
+
+class OnnxEmbeddings:
+    """
+    Drop-in embeddings backend: batched tokenization, one session.run per
+    batch, then mean pooling + L2 normalization in numpy.
+    """
+
+    def __init__(self, model_dir: str = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = model_dir or ONNX_MODEL_DIR
+        try:
+            # exported dirs usually carry the tokenizer files alongside
+            self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        except Exception:
+            # quantized output dirs may ship only the graph; the tokenizer
+            # is model-independent, so load it from the base checkpoint
+            self.tokenizer = AutoTokenizer.from_pretrained(BASE_MODEL)
+        self.session = ort.InferenceSession(
+            _resolve_model_file(model_dir),
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, texts):
+        enc = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=MAX_LENGTH,
+            return_tensors="np",
+        )
+        feeds = {k: v for k, v in enc.items() if k in self._input_names}
+        hidden = self.session.run(None, feeds)[0]  # last_hidden_state (B, T, H)
+
+        # Masked mean pooling, then unit-norm rows (matches the
+        # sentence-transformers pooling for this model).
+        mask = enc["attention_mask"][:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return pooled / norms
+
+    def embed_documents(self, texts):
+        vectors = []
+        for i in range(0, len(texts), BATCH_SIZE):
+            vectors.extend(self._encode_batch(list(texts[i:i + BATCH_SIZE])).tolist())
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
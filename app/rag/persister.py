@@ -0,0 +1,90 @@
+"""
+persister.py
+------------
+Debounced, non-blocking vectordb persistence.
+
+vectordb.persist() does synchronous disk I/O, so calling it inline after
+every ingest serializes throughput under cron load. Writers instead call
+request_persist(), and a single background consumer coalesces requests:
+it waits a short window after the first request, then persists once for
+everything that accumulated.
+
+A plain daemon thread (rather than an event-loop task) is used so the
+consumer survives the short-lived loops created by the synchronous
+ingest_url entry point. The FastAPI shutdown hook and atexit both call
+shutdown() to drain and persist one final time.
+"""
+
+import atexit
+import threading
+
+from app.rag.vectordb import get_vector_db
+
+# Coalescing window: after a persist request arrives, wait this long for
+# more requests before fsyncing once.
+DEBOUNCE_SECONDS = 2.0
+
+_wake = threading.Event()
+_stop = threading.Event()
+_thread = None
+_thread_lock = threading.Lock()
+
+# Extra flush work to run after each debounced persist, e.g. writing the
+# FAISS duplicate index. Hooks run after the Chroma persist so auxiliary
+# state on disk never gets ahead of the documents it refers to.
+_hooks = []
+
+
+def add_persist_hook(fn) -> None:
+    """Register fn to run after every persist (idempotent)."""
+    if fn not in _hooks:
+        _hooks.append(fn)
+
+
+def _do_persist() -> None:
+    try:
+        get_vector_db().persist()
+    except Exception:
+        # some wrappers persist automatically
+        pass
+    for fn in list(_hooks):
+        try:
+            fn()
+        except Exception:
+            pass
+
+
+def _consume() -> None:
+    while True:
+        _wake.wait()
+        if _stop.is_set():
+            return
+        _wake.clear()
+        # let further requests pile up, then persist once for all of them
+        if _stop.wait(DEBOUNCE_SECONDS):
+            return
+        _do_persist()
+
+
+def request_persist() -> None:
+    """Ask the background persister to persist soon (non-blocking)."""
+    global _thread
+    if _stop.is_set():
+        _do_persist()
+        return
+    if _thread is None:
+        with _thread_lock:
+            if _thread is None:
+                _thread = threading.Thread(target=_consume, name="vectordb-persister", daemon=True)
+                _thread.start()
+                atexit.register(shutdown)
+    _wake.set()
+
+
+def shutdown() -> None:
+    """Stop the consumer, then persist once more to flush anything pending."""
+    _stop.set()
+    _wake.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+    _do_persist()
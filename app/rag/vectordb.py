@@ -6,6 +6,7 @@ Compatible with LangChain 1.1.0
 Creates a Chroma vector DB with SentenceTransformer embeddings.
 """
 
+import functools
 import os
 from langchain_community.vectorstores import Chroma
 from app.rag.embedder import get_embedding_model
@@ -13,9 +14,13 @@ from app.rag.embedder import get_embedding_model
 CHROMA_DIR = "vector_store"
 
 
+@functools.lru_cache(maxsize=1)
 def get_vector_db():
     """
     Initializes (or loads) a ChromaDB instance.
+
+    Memoized: Chroma is opened once per process, avoiding repeated
+    file-handle churn from ingest/validate/query paths.
     """
 
     if not os.path.exists(CHROMA_DIR):
@@ -0,0 +1,103 @@
+"""
+writer.py
+---------
+Batched writes to the Chroma collection.
+
+Every vectordb.persist() fsyncs the on-disk store, so writing one article
+at a time makes disk I/O dominate batch ingestion. BatchWriter buffers
+(embedding, document, metadata, id) tuples and flushes them to Chroma in
+a single collection.add call, persisting once per flush. The cron job
+shares one deferred writer across the whole batch and flushes at the end;
+single-URL endpoints keep write-through behaviour via the default
+immediate writer (toggle with INGEST_IMMEDIATE_FLUSH).
+"""
+
+import os
+import threading
+
+from app.rag.persister import request_persist
+from app.rag.vectordb import get_vector_db
+
+# Flush after this many buffered chunks even in deferred mode.
+BATCH_SIZE = 64
+
+IMMEDIATE_FLUSH = os.getenv("INGEST_IMMEDIATE_FLUSH", "1") not in ("0", "false", "no")
+
+
+class BatchWriter:
+
+    def __init__(self, batch_size: int = BATCH_SIZE, immediate: bool = False):
+        self.batch_size = batch_size
+        self.immediate = immediate
+        self._lock = threading.Lock()
+        self._embeddings = []
+        self._documents = []
+        self._metadatas = []
+        self._ids = []
+        self._callbacks = []
+
+    def add(self, embeddings, documents, metadatas, ids, on_success=None) -> None:
+        """
+        Buffer one article's chunks; flush when the batch is full.
+        on_success runs only after the chunks are actually written to
+        Chroma, so callers can defer their success bookkeeping until then.
+        """
+        with self._lock:
+            self._embeddings.extend(embeddings)
+            self._documents.extend(documents)
+            self._metadatas.extend(metadatas)
+            self._ids.extend(ids)
+            if on_success is not None:
+                self._callbacks.append(on_success)
+            should_flush = self.immediate or len(self._documents) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything buffered in one Chroma add + one persist."""
+        with self._lock:
+            if not self._documents:
+                return
+            embeddings, self._embeddings = self._embeddings, []
+            documents, self._documents = self._documents, []
+            metadatas, self._metadatas = self._metadatas, []
+            ids, self._ids = self._ids, []
+            callbacks, self._callbacks = self._callbacks, []
+
+        vectordb = get_vector_db()
+        try:
+            vectordb._collection.add(  # type: ignore[attr-defined]
+                embeddings=embeddings,
+                documents=documents,
+                metadatas=metadatas,
+                ids=ids,
+            )
+        except Exception:
+            # Fallback: wrapper-level add (re-embeds internally). If this
+            # raises too, the error propagates and no callback fires — the
+            # affected URLs stay unmarked and can be retried.
+            vectordb.add_texts(documents, metadatas=metadatas, ids=ids)
+
+        # Debounced: the background persister coalesces flushes from
+        # concurrent pipelines into one fsync instead of blocking here.
+        request_persist()
+
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+
+_default_writer = None
+_default_writer_lock = threading.Lock()
+
+
+def get_default_writer() -> BatchWriter:
+    """Process-wide writer used when no batch writer is passed in."""
+    global _default_writer
+    if _default_writer is None:
+        with _default_writer_lock:
+            if _default_writer is None:
+                _default_writer = BatchWriter(immediate=IMMEDIATE_FLUSH)
+    return _default_writer
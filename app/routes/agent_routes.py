@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Query
-from app.agent.manager_agent import ingest_url
+from app.agent.manager_agent import ingest_url_async
 
 router = APIRouter(prefix="/agent", tags=["Agent"])
 
 @router.get("/ingest")
-def ingest(url: str = Query(...)):
-    return ingest_url(url)
+async def ingest(url: str = Query(...)):
+    return await ingest_url_async(url)
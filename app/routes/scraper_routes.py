@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Query
-from app.scraper.scraper import scrape_single
+from app.scraper.scraper import ascrape_single
 from app.scraper.cron import run_cron_job
 
 router = APIRouter(prefix="/scraper", tags=["Scraper"])
 
 @router.get("/scrape")
-def scrape_url(url: str = Query(...)):
-    return scrape_single(url)
+async def scrape_url(url: str = Query(...)):
+    return await ascrape_single(url)
 
 @router.get("/cron")
-def cron_run():
-    return run_cron_job()
+async def cron_run():
+    return await run_cron_job()
@@ -1,4 +1,7 @@
-from app.agent.manager_agent import ingest_url
+from app.agent.manager_agent import ingest_url_async, ingest_url
 
 def scrape_single(url: str) -> dict:
     return ingest_url(url)
+
+async def ascrape_single(url: str) -> dict:
+    return await ingest_url_async(url)